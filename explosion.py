@@ -1,8 +1,7 @@
-import asyncio
 import curses
-from tools import draw_frame, get_frame_size
+from tools import draw_frame, parse_frame, sleep
 
-EXPLOSION_FRAMES = [
+EXPLOSION_FRAMES = [parse_frame(text) for text in [
     """\
            (_)
        (  (   (  (
@@ -27,11 +26,11 @@ EXPLOSION_FRAMES = [
             (
 
     """,
-]
+]]
 
 
 async def explode(canvas, center_row, center_column):
-    rows, columns = get_frame_size(EXPLOSION_FRAMES[0])
+    rows, columns = EXPLOSION_FRAMES[0].rows, EXPLOSION_FRAMES[0].columns
     corner_row = center_row - rows / 2
     corner_column = center_column - columns / 2
 
@@ -40,6 +39,6 @@ async def explode(canvas, center_row, center_column):
 
         draw_frame(canvas, corner_row, corner_column, frame)
 
-        await asyncio.sleep(0)
+        await sleep()
         draw_frame(canvas, corner_row, corner_column, frame, negative=True)
-        await asyncio.sleep(0)
+        await sleep()
@@ -1,3 +1,6 @@
+import functools
+
+
 PHRASES = {
     # Только на английском, Repl.it ломается на кириллице
     1957: "First Sputnik",
@@ -11,6 +14,7 @@ PHRASES = {
 }
 
 
+@functools.lru_cache(maxsize=None)
 def get_garbage_delay_tics(year):
     if year < 1961:
         return None
@@ -1,16 +1,19 @@
 import asyncio
 import curses
-import time
 import random
 import os
-import itertools
 
-from tools import get_frame_size, draw_frame, read_frames, read_controls
+from tools import draw_frame, parse_frame, read_frames, read_controls, sleep
 from physics import update_speed
-from obstacles import Obstacle, show_obstacles
+from obstacles import Obstacle, show_obstacles, find_collision
 from explosion import explode
 from game_scenario import PHRASES, get_garbage_delay_tics
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 
 TIC_TIMEOUT = 0.1
 TICS_PER_YEAR = 20
@@ -20,6 +23,14 @@ SPACESHIP_FRAMES_FOLDER = os.path.join(FRAMES_FOLDER, 'spaceship')
 GARBAGE_FRAMES_FOLDER = os.path.join(FRAMES_FOLDER, 'garbage')
 GAME_OVER_FRAME_FILE = os.path.join(FRAMES_FOLDER, 'game_over.txt')
 
+SPACESHIP_FRAMES = read_frames(
+    os.path.join(SPACESHIP_FRAMES_FOLDER, file) for file in sorted(os.listdir(SPACESHIP_FRAMES_FOLDER))
+)
+GARBAGE_FRAMES = read_frames(
+    os.path.join(GARBAGE_FRAMES_FOLDER, file) for file in sorted(os.listdir(GARBAGE_FRAMES_FOLDER))
+)
+GAME_OVER_FRAME = read_frames([GAME_OVER_FRAME_FILE])[0]
+
 BORDER_LENGTH = 1
 CAPTION_WINDOW_LENGTH_PART = 3  # x means that caption window length is 1/x of the screen length.
 
@@ -30,125 +41,136 @@ SHOW_OBSTACLES = False
 
 coroutines = []
 obstacles = []
-obstacles_in_last_collisions = []
+bullets = []
 year = 1957
+tic = 0  # Number of tics since the game start, increased by the main loop.
+screen_size = (0, 0)  # (rows, columns) of the canvas, updated once per tic.
 
 
-async def sleep(tics=1):
-    """Do nothing for a specified amount of tics."""
-    for _ in range(tics):
-        await asyncio.sleep(0)
-
-
-async def show_caption(canvas):
-    """Show scenario text in the bottom of the screen."""
-    global year
-
-    max_rows, max_columns = canvas.getmaxyx()
+def create_caption_window():
+    """Create a window for scenario text in the bottom of the screen."""
+    max_rows, max_columns = screen_size
     caption_window_nlines = 1 + BORDER_LENGTH * 2
     caption_window_ncols = max_columns // CAPTION_WINDOW_LENGTH_PART
     caption_window_begin_y = max_rows - BORDER_LENGTH - caption_window_nlines
     caption_window_begin_x = max_columns // 2 - caption_window_ncols // 2
 
-    caption_window = canvas.derwin(
+    return curses.newwin(
         caption_window_nlines,
         caption_window_ncols,
         caption_window_begin_y,
         caption_window_begin_x,
     )
 
-    while True:
-        caption_text = f'Year {year}'
-        if year in PHRASES:
-            caption_text = caption_text + '. ' + PHRASES[year]
 
-        caption_row = 1
-        caption_column = caption_window_ncols // 2 - len(caption_text) // 2
+async def show_caption(caption_window):
+    """Show scenario text in the caption window."""
+    global year
+
+    caption_window_ncols = caption_window.getmaxyx()[1]
+    drawn_year = None
 
-        draw_frame(caption_window, caption_row, caption_column, caption_text)
+    while True:
+        if year != drawn_year:
+            caption_text = f'Year {year}'
+            if year in PHRASES:
+                caption_text = caption_text + '. ' + PHRASES[year]
+
+            caption_row = 1
+            caption_column = caption_window_ncols // 2 - len(caption_text) // 2
+
+            caption_window.erase()
+            draw_frame(caption_window, caption_row, caption_column, parse_frame(caption_text))
+            caption_window.border()
+            drawn_year = year
         await sleep()
-        draw_frame(caption_window, caption_row, caption_column, caption_text, negative=True)
 
 
-async def handle_year(tics_per_year):
-    """Increase the game's year after a specified amount of tics."""
+def handle_year(tics_per_year):
+    """Increase the game's year every specified amount of tics. Called once per tic."""
     global year
-    while True:
-        await sleep(tics_per_year)
+    if tic % tics_per_year == 0:
         year += 1
 
 
-async def draw_star(canvas, row, column, symbol='*', offset_tics=0):
-    """Draw a single star."""
+async def blink_stars(canvas, stars):
+    """Make stars blink. Every star is a tuple (row, column, symbol, offset_tics)."""
     tics_bold = 5
     tics_dim = 20
     tics_before_bold = 3
     tics_after_bold = 3
 
-    canvas.addstr(row, column, symbol, curses.A_DIM)
-    await sleep(offset_tics)
+    # Attribute of a star for every tic of a blink cycle.
+    blink_attributes = (
+        [curses.A_NORMAL] * tics_before_bold
+        + [curses.A_BOLD] * tics_bold
+        + [curses.A_NORMAL] * tics_after_bold
+        + [curses.A_DIM] * tics_dim
+    )
+    blink_cycle_length = len(blink_attributes)
+    blink_phases = [
+        (phase, attribute) for phase, attribute in enumerate(blink_attributes)
+        if attribute != blink_attributes[phase - 1]
+    ]
 
-    while True:
-        canvas.addstr(row, column, symbol)
-        await sleep(tics_before_bold)
-        canvas.addstr(row, column, symbol, curses.A_BOLD)
-        await sleep(tics_bold)
-        canvas.addstr(row, column, symbol)
-        await sleep(tics_after_bold)
+    # Stars to redraw on every tic of a blink cycle, so nothing is calculated per tic.
+    blink_schedule = [[] for _ in range(blink_cycle_length)]
+    for row, column, symbol, offset_tics in stars:
         canvas.addstr(row, column, symbol, curses.A_DIM)
-        await sleep(tics_dim)
+        for phase, attribute in blink_phases:
+            blink_tic = (offset_tics + phase) % blink_cycle_length
+            blink_schedule[blink_tic].append((row, column, symbol, attribute))
+
+    while True:
+        for stars_to_redraw in blink_schedule:
+            for row, column, symbol, attribute in stars_to_redraw:
+                canvas.addstr(row, column, symbol, attribute)
+            await sleep()
 
 
 def create_stars(canvas, count):
     """Fill the screen with a specified amount of stars."""
     star_size = 1
     max_rows, max_columns = (
-        max_coordinate - star_size - BORDER_LENGTH for max_coordinate in canvas.getmaxyx()
+        max_coordinate - star_size - BORDER_LENGTH for max_coordinate in screen_size
     )
     min_rows = min_columns = BORDER_LENGTH
 
-    global coroutines
+    stars = []
     for _ in range(count):
         row = random.randint(min_rows, max_rows)
         column = random.randint(min_columns, max_columns)
         symbol = random.choice('+*.:')
         offset_blink = random.randint(1, 20)
-        coroutines.append(draw_star(canvas, row, column, symbol, offset_blink))
+        stars.append((row, column, symbol, offset_blink))
 
+    global coroutines
+    coroutines.append(blink_stars(canvas, stars))
 
-async def fill_orbit_with_garbage(canvas):
-    """Fill screen with garbage. Garbage amount slowly increases by time."""
-    garbage_frame_files = [
-        os.path.join(GARBAGE_FRAMES_FOLDER, file) for file in os.listdir(GARBAGE_FRAMES_FOLDER)
-    ]
-    garbage_frames = read_frames(garbage_frame_files)
 
+def fill_orbit_with_garbage(canvas):
+    """Fill screen with garbage. Garbage amount slowly increases by time. Called once per tic."""
     global coroutines
-    global year
 
-    while True:
-        delay_tics = get_garbage_delay_tics(year)
-        if delay_tics is not None:
-            coroutines.append(
-                fly_garbage(
-                    canvas=canvas,
-                    column=random.randint(0, canvas.getmaxyx()[1]),
-                    garbage_frame=random.choice(garbage_frames)
-                )
+    delay_tics = get_garbage_delay_tics(year)
+    if delay_tics is not None and tic % delay_tics == 0:
+        coroutines.append(
+            fly_garbage(
+                canvas=canvas,
+                column=random.randint(0, screen_size[1]),
+                garbage_frame=random.choice(GARBAGE_FRAMES)
             )
-            await sleep(delay_tics)
-        else:
-            await sleep()
+        )
 
 
 async def fly_garbage(canvas, column, garbage_frame, speed=0.5):
     """Animate garbage, flying from top to bottom. Сolumn position will stay same, as specified on start."""
-    rows_number, columns_number = canvas.getmaxyx()
+    rows_number, columns_number = screen_size
     column = max(column, 0)
     column = min(column, columns_number - 1)
     row = 0
 
-    garbage_frame_size_rows, garbage_frame_size_columns = get_frame_size(garbage_frame)
+    garbage_frame_size_rows, garbage_frame_size_columns = garbage_frame.rows, garbage_frame.columns
     obstacle = Obstacle(row, column, garbage_frame_size_rows, garbage_frame_size_columns)
     obstacles.append(obstacle)
 
@@ -160,8 +182,7 @@ async def fly_garbage(canvas, column, garbage_frame, speed=0.5):
             draw_frame(canvas, row, column, garbage_frame, negative=True)
             row += speed
 
-            if obstacle in obstacles_in_last_collisions:
-                obstacles_in_last_collisions.remove(obstacle)
+            if obstacle.destroyed:
                 garbage_frame_center_row = row + garbage_frame_size_rows // 2
                 garbage_frame_center_column = column + garbage_frame_size_columns // 2
                 await explode(canvas, garbage_frame_center_row, garbage_frame_center_column)
@@ -170,109 +191,153 @@ async def fly_garbage(canvas, column, garbage_frame, speed=0.5):
         obstacles.remove(obstacle)
 
 
-async def draw_fire(canvas, start_row, start_column, rows_speed=-0.3, columns_speed=0):
-    """Display animation of gun shot. Direction and speed can be specified."""
-    row, column = start_row, start_column
+class Bullet:
+    """Gun shot. Direction and speed can be specified."""
 
-    canvas.addstr(round(row), round(column), '*')
-    await sleep()
-    canvas.addstr(round(row), round(column), 'O')
-    await sleep()
-    canvas.addstr(round(row), round(column), ' ')
+    __slots__ = (
+        'row', 'column', 'rows_speed', 'columns_speed', 'symbol',
+        'tics_lived', 'drawn_row', 'drawn_column', 'alive',
+    )
 
-    row += rows_speed
-    column += columns_speed
+    def __init__(self, start_row, start_column, rows_speed=-0.3, columns_speed=0):
+        self.row = start_row
+        self.column = start_column
+        self.rows_speed = rows_speed
+        self.columns_speed = columns_speed
+        self.symbol = '-' if columns_speed else '|'
+        self.tics_lived = 0
+        # Shot moves slower than one cell per tic, so it is redrawn only when it gets to a new cell.
+        self.drawn_row = self.drawn_column = None
+        self.alive = True
 
-    symbol = '-' if columns_speed else '|'
-    rows, columns = canvas.getmaxyx()
-    max_row, max_column = rows - BORDER_LENGTH, columns - BORDER_LENGTH
 
-    curses.beep()
+async def update_bullets(canvas):
+    """Display animation of all gun shots, moving them in a single pass per tic."""
+    launch_symbols = ('*', 'O')
 
-    while 0 < row < max_row and 0 < column < max_column:
-        for obstacle in obstacles:
-            if obstacle.has_collision(row, column):
-                obstacles_in_last_collisions.append(obstacle)
-                return
-        canvas.addstr(round(row), round(column), symbol)
+    while True:
+        rows, columns = screen_size
+        max_row, max_column = rows - BORDER_LENGTH, columns - BORDER_LENGTH
+
+        for bullet in bullets:
+            tics_lived = bullet.tics_lived
+            bullet.tics_lived += 1
+
+            if tics_lived < len(launch_symbols):
+                canvas.addstr(round(bullet.row), round(bullet.column), launch_symbols[tics_lived])
+                continue
+            if tics_lived == len(launch_symbols):
+                canvas.addstr(round(bullet.row), round(bullet.column), ' ')
+                bullet.row += bullet.rows_speed
+                bullet.column += bullet.columns_speed
+                curses.beep()
+
+            row, column = bullet.row, bullet.column
+            obstacle = None
+            is_on_screen = 0 < row < max_row and 0 < column < max_column
+            if is_on_screen:
+                obstacle = find_collision(obstacles, row, column)
+
+            if not is_on_screen or obstacle is not None:
+                if obstacle is not None:
+                    obstacle.destroyed = True
+                if bullet.drawn_row is not None:
+                    canvas.addstr(bullet.drawn_row, bullet.drawn_column, ' ')
+                bullet.alive = False
+                continue
+
+            bullet_row, bullet_column = round(row), round(column)
+            if bullet_row != bullet.drawn_row or bullet_column != bullet.drawn_column:
+                if bullet.drawn_row is not None:
+                    canvas.addstr(bullet.drawn_row, bullet.drawn_column, ' ')
+                canvas.addstr(bullet_row, bullet_column, bullet.symbol)
+                bullet.drawn_row, bullet.drawn_column = bullet_row, bullet_column
+            bullet.row += bullet.rows_speed
+            bullet.column += bullet.columns_speed
+
+        bullets[:] = [bullet for bullet in bullets if bullet.alive]
         await sleep()
-        canvas.addstr(round(row), round(column), ' ')
-        row += rows_speed
-        column += columns_speed
 
 
 async def run_spaceship(canvas, start_row, start_column):
     """Display animation of a spaceship."""
-    spaceship_frame_files = [
-        os.path.join(SPACESHIP_FRAMES_FOLDER, file) for file in os.listdir(SPACESHIP_FRAMES_FOLDER)
-    ]
-    spaceship_frames = read_frames(spaceship_frame_files)
-
     tics_between_animations = 2
 
-    max_rows, max_columns = (max_coordinate - BORDER_LENGTH for max_coordinate in canvas.getmaxyx())
-    min_rows = min_columns = BORDER_LENGTH
+    spaceship_size_rows = max(frame.rows for frame in SPACESHIP_FRAMES)
+    spaceship_size_columns = max(frame.columns for frame in SPACESHIP_FRAMES)
+
+    max_rows, max_columns = (max_coordinate - BORDER_LENGTH for max_coordinate in screen_size)
+    min_row = min_column = BORDER_LENGTH
+    max_row = max_rows - spaceship_size_rows
+    max_column = max_columns - spaceship_size_columns
     row, column = start_row, start_column
     row_speed = column_speed = 0
 
-    spaceship_animations_cycle = itertools.chain.from_iterable(
-        [[frame]*tics_between_animations for frame in spaceship_frames]
+    # Frame to show on every tic of an animation cycle.
+    spaceship_animation = tuple(
+        frame for frame in SPACESHIP_FRAMES for _ in range(tics_between_animations)
     )
+    spaceship_animation_length = len(spaceship_animation)
 
-    for spaceship_frame in itertools.cycle(spaceship_animations_cycle):
+    while True:
+        spaceship_frame = spaceship_animation[tic % spaceship_animation_length]
         rows_direction, columns_direction, fire_button_pressed = read_controls(canvas)
         row_speed, column_speed = update_speed(
             row_speed, column_speed, rows_direction, columns_direction
         )
         row = row + row_speed
         column = column + column_speed
-        spaceship_size_rows, spaceship_size_columns = get_frame_size(spaceship_frame)
-        row = max(row, min_rows)
-        row = min(row, max_rows - spaceship_size_rows)
-        column = max(column, min_columns)
-        column = min(column, max_columns - spaceship_size_columns)
+        if row < min_row:
+            row = min_row
+        elif row > max_row:
+            row = max_row
+        if column < min_column:
+            column = min_column
+        elif column > max_column:
+            column = max_column
 
         if fire_button_pressed and year >= GUN_AVAILABLE_YEAR:
             spaceship_center_column = column + spaceship_size_columns // 2
-            coroutines.append(
-                draw_fire(canvas, start_row=row, start_column=spaceship_center_column)
-            )
+            bullets.append(Bullet(start_row=row, start_column=spaceship_center_column))
         draw_frame(canvas, row, column, spaceship_frame)
         await sleep()
         draw_frame(canvas, row, column, spaceship_frame, negative=True)
 
-        for obstacle in obstacles:
-            if obstacle.has_collision(row, column, spaceship_size_rows, spaceship_size_columns):
-                obstacles_in_last_collisions.append(obstacle)
-                coroutines.append(show_gameover(canvas))
-                return
+        obstacle = find_collision(obstacles, row, column, spaceship_size_rows, spaceship_size_columns)
+        if obstacle is not None:
+            obstacle.destroyed = True
+            coroutines.append(show_gameover(canvas))
+            return
 
 
 async def show_gameover(canvas):
     """Show "Game Over" text in the center of the screen."""
-    gameover_frame = read_frames([GAME_OVER_FRAME_FILE])[0]
-    gameover_frame_size_rows, gameover_frame_size_columns = get_frame_size(gameover_frame)
-    central_row, central_column = (max_coordinate // 2 for max_coordinate in canvas.getmaxyx())
+    gameover_frame_size_rows, gameover_frame_size_columns = GAME_OVER_FRAME.rows, GAME_OVER_FRAME.columns
+    central_row, central_column = (max_coordinate // 2 for max_coordinate in screen_size)
 
     row = central_row - gameover_frame_size_rows // 2
     column = central_column - gameover_frame_size_columns // 2
 
     while True:
-        draw_frame(canvas, row, column, gameover_frame)
+        draw_frame(canvas, row, column, GAME_OVER_FRAME)
         await sleep()
 
 
-def main(canvas):
+async def main_async(canvas):
     canvas.border()
     canvas.nodelay(True)
+    canvas.leaveok(True)
     curses.curs_set(0)
 
     global coroutines
     global obstacles
+    global screen_size
+    global tic
 
+    screen_size = canvas.getmaxyx()
     create_stars(canvas, count=100)
 
-    central_row, central_column = (max_coordinate//2 for max_coordinate in canvas.getmaxyx())
+    central_row, central_column = (max_coordinate//2 for max_coordinate in screen_size)
     coroutines.append(
         run_spaceship(
             canvas=canvas,
@@ -281,22 +346,48 @@ def main(canvas):
         )
     )
 
-    coroutines.append(fill_orbit_with_garbage(canvas))
-    coroutines.append(handle_year(TICS_PER_YEAR))
-    coroutines.append(show_caption(canvas))
+    coroutines.append(update_bullets(canvas))
+    caption_window = create_caption_window()
+    coroutines.append(show_caption(caption_window))
     if SHOW_OBSTACLES:
         coroutines.append((show_obstacles(canvas, obstacles)))
 
+    loop = asyncio.get_running_loop()
+    tic_deadline = loop.time()
+
     while True:
-        for coroutine in coroutines.copy():
+        screen_size = canvas.getmaxyx()
+        fill_orbit_with_garbage(canvas)
+
+        # Coroutines spawned during the tic are appended to the new list too.
+        running_coroutines, coroutines = coroutines, []
+        for coroutine in running_coroutines:
             try:
                 coroutine.send(None)
             except StopIteration:
-                coroutines.remove(coroutine)
-        canvas.refresh()
-        time.sleep(TIC_TIMEOUT)
+                continue
+            coroutines.append(coroutine)
+        canvas.border()
+        canvas.noutrefresh()
+        # Caption window is drawn over the canvas, whatever has changed under it.
+        caption_window.touchwin()
+        caption_window.noutrefresh()
+        curses.doupdate()
+
+        tic += 1
+        handle_year(TICS_PER_YEAR)
+
+        # Time spent on game logic and terminal output is a part of the tic, not an extra delay.
+        tic_deadline = max(tic_deadline + TIC_TIMEOUT, loop.time())
+        await asyncio.sleep(tic_deadline - loop.time())
+
+
+def main(canvas):
+    asyncio.run(main_async(canvas))
 
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        uvloop.install()
     curses.update_lines_cols()
     curses.wrapper(main)
@@ -1,20 +1,23 @@
-import asyncio
-from tools import draw_frame
+from tools import draw_frame, parse_frame, sleep
 
 
 class Obstacle:
 
+    # Attributes are read for every obstacle on every collision scan, slots make it faster.
+    __slots__ = ('row', 'column', 'rows_size', 'columns_size', 'uid', 'destroyed')
+
     def __init__(self, row, column, rows_size=1, columns_size=1, uid=None):
         self.row = row
         self.column = column
         self.rows_size = rows_size
         self.columns_size = columns_size
         self.uid = uid
+        self.destroyed = False
 
     def get_bounding_box_frame(self):
         # increment box size to compensate obstacle movement
         rows, columns = self.rows_size + 1, self.columns_size + 1
-        return '\n'.join(_get_bounding_box_lines(rows, columns))
+        return parse_frame('\n'.join(_get_bounding_box_lines(rows, columns)))
 
     def get_bounding_box_corner_pos(self):
         return self.row - 1, self.column - 1
@@ -53,36 +56,40 @@ async def show_obstacles(canvas, obstacles):
         for row, column, frame in boxes:
             draw_frame(canvas, row, column, frame)
 
-        await asyncio.sleep(0)
+        await sleep()
 
         for row, column, frame in boxes:
             draw_frame(canvas, row, column, frame, negative=True)
 
 
-def _is_point_inside(corner_row, corner_column, size_rows, size_columns, point_row, point_row_column):
-    rows_flag = corner_row <= point_row < corner_row + size_rows
-    columns_flag = corner_column <= point_row_column < corner_column + size_columns
-
-    return rows_flag and columns_flag
-
-
 def has_collision(obstacle_corner, obstacle_size, obj_corner, obj_size=(1, 1)):
     """Determine if collision has occured. Return True or False."""
 
-    opposite_obstacle_corner = (
-        obstacle_corner[0] + obstacle_size[0] - 1,
-        obstacle_corner[1] + obstacle_size[1] - 1,
-    )
+    obstacle_row, obstacle_column = obstacle_corner
+    obstacle_size_rows, obstacle_size_columns = obstacle_size
+    obj_row, obj_column = obj_corner
+    obj_size_rows, obj_size_columns = obj_size
 
-    opposite_obj_corner = (
-        obj_corner[0] + obj_size[0] - 1,
-        obj_corner[1] + obj_size[1] - 1,
+    return (
+        obstacle_row < obj_row + obj_size_rows and obj_row < obstacle_row + obstacle_size_rows
+        and obstacle_column < obj_column + obj_size_columns
+        and obj_column < obstacle_column + obstacle_size_columns
     )
 
-    return any([
-        _is_point_inside(*obstacle_corner, *obstacle_size, *obj_corner),
-        _is_point_inside(*obstacle_corner, *obstacle_size, *opposite_obj_corner),
 
-        _is_point_inside(*obj_corner, *obj_size, *obstacle_corner),
-        _is_point_inside(*obj_corner, *obj_size, *opposite_obstacle_corner),
-    ])
+def find_collision(obstacles, obj_corner_row, obj_corner_column, obj_size_rows=1, obj_size_columns=1):
+    """Find an obstacle the object collides with. Return the obstacle or None.
+
+    Same check as has_collision(), inlined to scan all obstacles in a single loop.
+    """
+    obj_end_row = obj_corner_row + obj_size_rows
+    obj_end_column = obj_corner_column + obj_size_columns
+
+    for obstacle in obstacles:
+        row, column = obstacle.row, obstacle.column
+        if (
+            row < obj_end_row and obj_corner_row < row + obstacle.rows_size
+            and column < obj_end_column and obj_corner_column < column + obstacle.columns_size
+        ):
+            return obstacle
+    return None
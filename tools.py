@@ -1,3 +1,8 @@
+import types
+from collections import namedtuple
+
+
+Frame = namedtuple('Frame', ['text', 'lines', 'rows', 'columns', 'cells'])
 
 
 SPACE_KEY_CODE = 32
@@ -6,6 +11,23 @@ RIGHT_KEY_CODE = 261
 UP_KEY_CODE = 259
 DOWN_KEY_CODE = 258
 
+# Key code -> (rows direction, columns direction, space pressed).
+KEY_CONTROLS = {
+    UP_KEY_CODE: (-1, 0, False),
+    DOWN_KEY_CODE: (1, 0, False),
+    RIGHT_KEY_CODE: (0, 1, False),
+    LEFT_KEY_CODE: (0, -1, False),
+    SPACE_KEY_CODE: (0, 0, True),
+}
+NO_CONTROLS = (0, 0, False)
+
+
+@types.coroutine
+def sleep(tics=1):
+    """Do nothing for a specified amount of tics."""
+    for _ in range(tics):
+        yield
+
 
 def read_controls(canvas):
     """Read keys pressed and returns tuple with controls state."""
@@ -18,61 +40,62 @@ def read_controls(canvas):
         if pressed_key_code == -1:
             # https://docs.python.org/3/library/curses.html#curses.window.getch
             break
-        if pressed_key_code == UP_KEY_CODE:
-            rows_direction = -1
-        if pressed_key_code == DOWN_KEY_CODE:
-            rows_direction = 1
-        if pressed_key_code == RIGHT_KEY_CODE:
-            columns_direction = 1
-        if pressed_key_code == LEFT_KEY_CODE:
-            columns_direction = -1
-        if pressed_key_code == SPACE_KEY_CODE:
-            space_pressed = True
+
+        key_rows_direction, key_columns_direction, key_space_pressed = KEY_CONTROLS.get(
+            pressed_key_code, NO_CONTROLS
+        )
+        rows_direction = key_rows_direction or rows_direction
+        columns_direction = key_columns_direction or columns_direction
+        space_pressed = space_pressed or key_space_pressed
 
     return rows_direction, columns_direction, space_pressed
 
 
-def draw_frame(canvas, start_row, start_column, text, negative=False):
+def draw_frame(canvas, start_row, start_column, frame, negative=False):
     """Draw multiline text fragment on canvas. Erase text instead of drawing if negative=True is specified."""
 
     rows_number, columns_number = canvas.getmaxyx()
-
-    for row, line in enumerate(text.splitlines(), round(start_row)):
-        if row < 0:
-            continue
-        if row >= rows_number:
-            break
-        for column, symbol in enumerate(line, round(start_column)):
-            if column < 0:
+    start_row, start_column = round(start_row), round(start_column)
+    end_row, end_column = start_row + frame.rows, start_column + frame.columns
+
+    # Curses will raise exception on writing to a lower right corner of the window. Don`t ask why…
+    # https://docs.python.org/3/library/curses.html#curses.window.addch
+    fits_window = (
+        start_row >= 0 and start_column >= 0
+        and end_row <= rows_number and end_column <= columns_number
+        and not (end_row == rows_number and end_column == columns_number)
+    )
+
+    for row_offset, column_offset, symbol in frame.cells:
+        row, column = start_row + row_offset, start_column + column_offset
+        if not fits_window:
+            if not (0 <= row < rows_number and 0 <= column < columns_number):
                 continue
-            if column >= columns_number:
-                break
-            if symbol == ' ':
-                continue
-
-            # Check that current position it is not in a lower right corner of the window
-            # Curses will raise exception in that case. Don`t ask why…
-            # https://docs.python.org/3/library/curses.html#curses.window.addch
             if row == rows_number - 1 and column == columns_number - 1:
                 continue
 
-            symbol = symbol if not negative else ' '
-            canvas.addch(row, column, symbol)
-            canvas.border()
+        symbol = symbol if not negative else ' '
+        canvas.addch(row, column, symbol)
 
 
-def get_frame_size(text):
-    """Calculate size of multiline text fragment. Returns pair (rows number, colums number)"""
+def parse_frame(text):
+    """Split multiline text fragment into lines and calculate its size once, to draw it many times."""
     lines = text.splitlines()
     rows = len(lines)
     columns = max([len(line) for line in lines])
+    cells = [
+        (row, column, symbol)
+        for row, line in enumerate(lines)
+        for column, symbol in enumerate(line)
+        if symbol != ' '
+    ]
 
-    return rows, columns
+    return Frame(text, lines, rows, columns, cells)
 
 
 def read_frames(frame_file_paths):
     frames = []
     for frame_file_path in frame_file_paths:
         with open(frame_file_path, 'r') as frame_file:
-            frames.append(frame_file.read())
+            frames.append(parse_frame(frame_file.read()))
     return frames